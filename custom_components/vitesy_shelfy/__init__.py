@@ -1,14 +1,103 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from .const import DOMAIN
+from homeassistant.util import dt as dt_util
+from .const import (
+    DOMAIN,
+    SERVICE_PROFILE,
+    SERVICE_GET_HISTORY,
+    ATTR_CYCLES,
+    ATTR_DEVICE_ID,
+    ATTR_SENSOR_ID,
+    ATTR_START,
+    ATTR_END,
+    ATTR_AGGREGATE,
+    DATA_EXECUTOR,
+    DATA_HISTORY,
+    EXECUTOR_MAX_WORKERS,
+    HISTORY_DB_FILE,
+    HISTORY_RETENTION_DAYS,
+)
 from .coordinator import VitesyDataUpdateCoordinator
-from .api import VitesyOAuth
+from .api import VitesyAuthError, VitesyOAuth
+from .history import AGGREGATES, VitesyHistoryStore
 # from .vitesy_api import VitesyAPI
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_CYCLES, default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+})
+
+GET_HISTORY_SCHEMA = vol.Schema({
+    vol.Required(ATTR_DEVICE_ID): cv.string,
+    vol.Required(ATTR_SENSOR_ID): cv.string,
+    vol.Optional(ATTR_START): cv.datetime,
+    vol.Optional(ATTR_END): cv.datetime,
+    vol.Optional(ATTR_AGGREGATE): vol.In(list(AGGREGATES)),
+})
+
+async def async_setup(hass: HomeAssistant, config):
+    # Blocking API calls run on a bounded pool of our own instead of HA's shared executor
+    executor = ThreadPoolExecutor(max_workers=EXECUTOR_MAX_WORKERS, thread_name_prefix=DOMAIN)
+    hass.data[DATA_EXECUTOR] = executor
+
+    history = VitesyHistoryStore(hass.config.path(HISTORY_DB_FILE), HISTORY_RETENTION_DAYS)
+    hass.data[DATA_HISTORY] = history
+
+    async def _async_shutdown_executor(event: Event):
+        executor.shutdown(wait=False, cancel_futures=True)
+        await hass.async_add_executor_job(history.close)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown_executor)
+
+    async def _async_profile(call: ServiceCall):
+        for coordinator in hass.data.get(DOMAIN, {}).values():
+            await coordinator.async_start_profiling(call.data[ATTR_CYCLES])
+
+    async def _async_get_history(call: ServiceCall):
+        end = dt_util.as_utc(call.data.get(ATTR_END) or dt_util.utcnow())
+        start = dt_util.as_utc(call.data.get(ATTR_START) or end - timedelta(days=1))
+        device_id = call.data[ATTR_DEVICE_ID].replace(":", "")
+        sensor_id = call.data[ATTR_SENSOR_ID]
+        aggregate = call.data.get(ATTR_AGGREGATE)
+        result = await hass.loop.run_in_executor(
+            executor, history.query, device_id, sensor_id, start.timestamp(), end.timestamp(), aggregate
+        )
+        response = {
+            ATTR_DEVICE_ID: device_id,
+            ATTR_SENSOR_ID: sensor_id,
+            ATTR_START: start.isoformat(),
+            ATTR_END: end.isoformat(),
+        }
+        if aggregate:
+            response[aggregate] = result
+        else:
+            response["samples"] = [
+                {"timestamp": dt_util.utc_from_timestamp(ts).isoformat(), "value": value}
+                for ts, value in result
+            ]
+        return response
+
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, _async_profile, schema=PROFILE_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        _async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     session = async_get_clientsession(hass)
     email = entry.data["email"]
@@ -16,13 +105,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     # ✅ Restore correct authentication+API layering
     api = VitesyOAuth(email, password, session)
-    await hass.async_add_executor_job(api.login)
+    if entry.data.get("refresh_token"):
+        # Reuse the session validated by the config/reauth flow; expired access
+        # tokens are renewed with the refresh token on first use
+        api.restore_tokens(entry.data.get("access_token"), entry.data["refresh_token"], entry.data.get("token_expires"))
+    else:
+        try:
+            await hass.loop.run_in_executor(hass.data[DATA_EXECUTOR], api.login)
+        except VitesyAuthError as err:
+            await hass.loop.run_in_executor(hass.data[DATA_EXECUTOR], api.close)
+            raise ConfigEntryAuthFailed(f"Vitesy login failed: {err}") from err
+        except Exception:
+            await hass.loop.run_in_executor(hass.data[DATA_EXECUTOR], api.close)
+            raise
     # api = VitesyAPI(oauth)
 
-    coordinator = VitesyDataUpdateCoordinator(hass, entry, api)
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = VitesyDataUpdateCoordinator(hass, entry, api, hass.data[DATA_EXECUTOR], hass.data[DATA_HISTORY])
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await hass.loop.run_in_executor(hass.data[DATA_EXECUTOR], api.close)
+        raise
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor", "button"])
 
-    return True
\ No newline at end of file
+    return True
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor", "button"])
+    if unload_ok:
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await hass.loop.run_in_executor(hass.data[DATA_EXECUTOR], coordinator.api.close)
+    return unload_ok
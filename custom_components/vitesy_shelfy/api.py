@@ -3,10 +3,18 @@ import base64
 import hashlib
 import secrets
 import logging
+import json
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlencode
 from urllib.parse import quote
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
+
 from .const import (
     LOGIN_URL,
     TOKEN_URL,
@@ -15,29 +23,49 @@ from .const import (
     SCOPE,
     OAUTH_HEADERS,
     API_BASE_URL,
+    DEVICES_URL,
+    DEVICES_FULL_EXPAND,
+    DEVICES_SUMMARY_EXPAND,
+    EXECUTOR_MAX_WORKERS,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+class VitesyAuthError(Exception):
+    """Raised when the credentials or refresh token are rejected."""
+
 class VitesyOAuth:
     def __init__(self, email, password, session):
         self.email = email
         self.password = password
         self.session = session
 
+        # Pooled keep-alive session shared by the integration's worker threads
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=EXECUTOR_MAX_WORKERS)
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
+        self._refresh_lock = threading.Lock()
+
         self.access_token = None
         self.refresh_token = None
         self.expires_at = None
         self.api_key = None
+        # Optional callback(phase, seconds), set while the refresh profiler runs
+        self.timing_hook = None
 
         self.code_verifier = self._generate_verifier()
         self.code_challenge = self._generate_challenge(self.code_verifier)
 
+    def close(self):
+        """Close the pooled HTTP session."""
+        self._http.close()
+
     def login(self):
         """Perform login and exchange tokens."""
         code = self._get_auth_code()
         if not code:
-            raise Exception("Failed to get auth code")
+            raise VitesyAuthError("Credentials rejected, no auth code returned")
 
         self._exchange_token(code)
 
@@ -58,8 +86,8 @@ class VitesyOAuth:
         url = f"{LOGIN_URL}?{urlencode(query)}"
         response = session.get(url)
         if "XSRF-TOKEN" not in session.cookies:
-            _LOGGER.error("CSRF token not found in cookies")
-            return None
+            # Login page problem or outage, not a credential rejection
+            raise Exception(f"CSRF token not found in cookies (HTTP {response.status_code})")
 
         csrf_token = session.cookies.get("XSRF-TOKEN")
 
@@ -76,6 +104,8 @@ class VitesyOAuth:
         }
 
         post_resp = session.post(url, headers=headers, data=data, allow_redirects=False)
+        if post_resp.status_code >= 500:
+            raise Exception(f"Login request failed: {post_resp.status_code}")
 
         if "location" in post_resp.headers:
             location = post_resp.headers["location"]
@@ -96,7 +126,7 @@ class VitesyOAuth:
             "code": code,
         }
 
-        resp = requests.post(TOKEN_URL, headers=OAUTH_HEADERS, data=payload)
+        resp = self._http.post(TOKEN_URL, headers=OAUTH_HEADERS, data=payload)
         if resp.status_code == 200:
             data = resp.json()
             self.access_token = data["access_token"]
@@ -105,56 +135,100 @@ class VitesyOAuth:
         else:
             raise Exception(f"Token exchange failed: {resp.status_code} {resp.text}")
 
+    def restore_tokens(self, access_token, refresh_token, expires_at):
+        """Reuse tokens from a previous login instead of logging in again."""
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_at = expires_at
+
     def refresh_access_token(self):
         """Use the refresh token to get a new access token."""
+        if not self.refresh_token:
+            raise VitesyAuthError("No refresh token available")
         payload = {
             "grant_type": "refresh_token",
             "client_id": CLIENT_ID,
             "refresh_token": self.refresh_token,
         }
 
-        resp = requests.post(TOKEN_URL, headers=OAUTH_HEADERS, data=payload)
+        resp = self._http.post(TOKEN_URL, headers=OAUTH_HEADERS, data=payload)
         if resp.status_code == 200:
             data = resp.json()
             self.access_token = data["access_token"]
             self.refresh_token = data.get("refresh_token", self.refresh_token)
             self.expires_at = time.time() + data.get("expires_in", 3600)
+        elif resp.status_code in (400, 401):
+            raise VitesyAuthError(f"Refresh token rejected: {resp.status_code} {resp.text}")
         else:
             raise Exception(f"Refresh token failed: {resp.status_code} {resp.text}")
 
     def _auth_headers(self):
         if self.is_token_expired():
-            self.refresh_access_token()
+            with self._refresh_lock:
+                if self.is_token_expired():
+                    self.refresh_access_token()
         return {
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json",
         }
         
-    def get_devices(self):
-        url = f"{API_BASE_URL}/devices?user_id=me&connected_once=true&expand=all%2C-place"
-        resp = requests.get(url, headers=self._auth_headers())
+    @staticmethod
+    def _decode(resp):
+        """Decode a JSON response body, using orjson when available."""
+        if orjson is not None:
+            return orjson.loads(resp.content)
+        return json.loads(resp.content)
+
+    def _get_json(self, url):
+        """GET an API url and decode the JSON body, reporting timings to the hook if set."""
+        headers = self._auth_headers()
+        if self.timing_hook is None:
+            resp = self._http.get(url, headers=headers)
+            resp.raise_for_status()
+            return self._decode(resp)
+
+        start = time.perf_counter()
+        resp = self._http.get(url, headers=headers)
         resp.raise_for_status()
-        return resp.json()
+        decode_start = time.perf_counter()
+        data = self._decode(resp)
+        self.timing_hook("http", decode_start - start)
+        self.timing_hook("decode", time.perf_counter() - decode_start)
+        return data
+
+    def _get_devices(self, expand):
+        query = urlencode({"user_id": "me", "connected_once": "true", "expand": expand})
+        return self._get_json(f"{DEVICES_URL}?{query}")
+
+    def get_devices(self):
+        """Fetch the fully expanded device records (discovery, firmware/model changes)."""
+        return self._get_devices(DEVICES_FULL_EXPAND)
+
+    def get_devices_summary(self):
+        """Fetch the lightweight device records used for routine polls."""
+        return self._get_devices(DEVICES_SUMMARY_EXPAND)
 
     def get_measurements(self, device_id):
         encoded_device_id = quote(device_id, safe='')
         url = f"{API_BASE_URL}/measurements?device_id={encoded_device_id}&latest=true"
-        resp = requests.get(url, headers=self._auth_headers())
-        resp.raise_for_status()
-        return resp.json()
+        return self._get_json(url)
 
     def get_maintenance(self, device_id):
         encoded_device_id = quote(device_id, safe='')
         url = f"{API_BASE_URL}/devices/{device_id}/maintenance"
-        resp = requests.get(url, headers=self._auth_headers())
-        resp.raise_for_status()
-        return resp.json()
+        return self._get_json(url)
 
     def get_programs(self, device_type, firmware_version):
         url = f"{API_BASE_URL}/programs/?device_type={device_type}&firmware_version={firmware_version}"
-        resp = requests.get(url, headers=self._auth_headers())
-        resp.raise_for_status()
-        return resp.json()
+        return self._get_json(url)
+
+    def get_device_details(self, device_id, device_type, firmware_version):
+        """Fetch measurements, maintenance and programs for one device in a single job."""
+        return {
+            "measurements": self.get_measurements(device_id),
+            "maintenancehistory": self.get_maintenance(device_id),
+            "programs": self.get_programs(device_type, firmware_version),
+        }
 
     def reset_filter(self, device_id):
         """Reset the filter maintenance period for a device."""
@@ -166,7 +240,7 @@ class VitesyOAuth:
             "User-Agent": "VitesyHub/5.3.10 (Android; HomeAssistant)",
             "Connection": "Keep-Alive",
         })
-        resp = requests.post(url, headers=headers)  # niente body
+        resp = self._http.post(url, headers=headers)  # niente body
         resp.raise_for_status()
         try:
             return resp.json()
@@ -183,7 +257,7 @@ class VitesyOAuth:
             "User-Agent": "VitesyHub/5.3.10 (Android; HomeAssistant)",
             "Connection": "Keep-Alive",
         })
-        resp = requests.post(url, headers=headers)  # niente body
+        resp = self._http.post(url, headers=headers)  # niente body
         resp.raise_for_status()
         try:
             return resp.json()
@@ -196,7 +270,7 @@ class VitesyOAuth:
         headers = self._auth_headers()
 
         # Try GET first
-        resp = requests.get(url, headers=headers)
+        resp = self._http.get(url, headers=headers)
         data = resp.json()
 
         if "apiKey" in data:
@@ -205,7 +279,7 @@ class VitesyOAuth:
 
         # If no apiKey and specific error, try POST
         if data.get("error", {}).get("message") == "User does not have ApiKey":
-            post_resp = requests.post(url, headers=headers)
+            post_resp = self._http.post(url, headers=headers)
             post_data = post_resp.json()
             if "apiKey" in post_data:
                 self.api_key = post_data["apiKey"]
@@ -45,7 +45,8 @@ class VitesyResetFilterButton(CoordinatorEntity, ButtonEntity):
         """Call the API to reset the filter maintenance period."""
         api = self.coordinator.api
         try:
-            result = await self.hass.async_add_executor_job(api.reset_filter, self.device_id_orig)
+            result = await self.coordinator.async_run_job(api.reset_filter, self.device_id_orig)
+            self.coordinator.request_full_device_refresh()
             _LOGGER.info("Filter reset successful for %s: %s", self.device_id_orig, result)
         except Exception as e:
             _LOGGER.error("Failed to reset filter for %s: %s", self.device_id_orig, e)
@@ -74,7 +75,8 @@ class VitesyResetFridgeButton(CoordinatorEntity, ButtonEntity):
         """Call the API to reset the fridge maintenance period."""
         api = self.coordinator.api
         try:
-            result = await self.hass.async_add_executor_job(api.reset_fridge, self.device_id_orig)
+            result = await self.coordinator.async_run_job(api.reset_fridge, self.device_id_orig)
+            self.coordinator.request_full_device_refresh()
             _LOGGER.info("Fridge reset successful for %s: %s", self.device_id_orig, result)
         except Exception as e:
             _LOGGER.error("Failed to reset fridge for %s: %s", self.device_id_orig, e)
@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    CHANGE_CONNECTED,
+    CHANGE_DOOR_OPENINGS,
+    CHANGE_MAINTENANCE_DUE,
+    CHANGE_PROGRAM,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class VitesyChange:
+    """One field that changed on a device between two coordinator snapshots."""
+
+    device_id: str
+    field: str
+    old: Any
+    new: Any
+    key: str | None = None  # maintenance kind ("filter"/"fridge") for due-date changes
+    delta: float | None = None  # increase for counters such as DOC-SY
+    reset: bool = False  # the counter went down, so ``delta`` is the count since the reset
+
+    def as_event_data(self):
+        data = {"device_id": self.device_id, "field": self.field, "old": self.old, "new": self.new}
+        if self.key is not None:
+            data["key"] = self.key
+        if self.delta is not None:
+            data["delta"] = self.delta
+        if self.reset:
+            data["reset"] = True
+        return data
+
+
+def snapshot_device(device):
+    """Extract the tracked fields from an assembled device record."""
+    door_openings = None
+    measurements = device.get("measurements")
+    if isinstance(measurements, list) and measurements:
+        for sensor in measurements[0].get("sensors_data", []):
+            if sensor.get("id") == "DOC-SY":
+                door_openings = (sensor.get("value") or {}).get("avg")
+                break
+    return {
+        CHANGE_PROGRAM: (device.get("program") or {}).get("ref"),
+        CHANGE_DOOR_OPENINGS: door_openings,
+        CHANGE_CONNECTED: device.get("connected"),
+        CHANGE_MAINTENANCE_DUE: {
+            key: (value or {}).get("due_date")
+            for key, value in (device.get("maintenance") or {}).items()
+            if isinstance(value, dict)
+        },
+    }
+
+
+def diff_snapshots(device_id, old, new):
+    """Return the changes between two snapshots of the same device."""
+    changes = []
+    for field in (CHANGE_PROGRAM, CHANGE_CONNECTED):
+        if old[field] != new[field]:
+            changes.append(VitesyChange(device_id, field, old[field], new[field]))
+
+    before, after = old[CHANGE_DOOR_OPENINGS], new[CHANGE_DOOR_OPENINGS]
+    if before != after:
+        delta, reset = None, False
+        if isinstance(before, (int, float)) and isinstance(after, (int, float)):
+            # Same counter semantics as RingBuffer.counter_rate: a drop is a reset
+            reset = after < before
+            delta = after if reset else after - before
+        changes.append(VitesyChange(device_id, CHANGE_DOOR_OPENINGS, before, after, delta=delta, reset=reset))
+
+    before, after = old[CHANGE_MAINTENANCE_DUE], new[CHANGE_MAINTENANCE_DUE]
+    for key in before.keys() | after.keys():
+        if before.get(key) != after.get(key):
+            changes.append(VitesyChange(device_id, CHANGE_MAINTENANCE_DUE, before.get(key), after.get(key), key=key))
+    return changes
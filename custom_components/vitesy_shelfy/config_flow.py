@@ -5,7 +5,7 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
 from .const import DOMAIN, CONF_EMAIL, CONF_PASSWORD
-from .api import VitesyOAuth
+from .api import VitesyAuthError, VitesyOAuth
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 _LOGGER = logging.getLogger(__name__)
@@ -16,30 +16,43 @@ class VitesyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    _reauth_entry = None
+
+    async def _async_login(self, email, password):
+        """Log in and return (entry data, error key)."""
+        session = async_get_clientsession(self.hass)
+        api = VitesyOAuth(email, password, session)
+        try:
+            await self.hass.async_add_executor_job(api.login)
+        except VitesyAuthError as e:
+            _LOGGER.warning("Vitesy login rejected: %s", e)
+            return None, "invalid_auth"
+        except Exception as e:
+            _LOGGER.exception("Error logging in to Vitesy API: %s", e)
+            return None, "cannot_connect"
+        finally:
+            # Only the tokens are handed over; setup builds its own client
+            await self.hass.async_add_executor_job(api.close)
+        if not api.access_token:
+            return None, "invalid_auth"
+        # Tokens are handed over to async_setup_entry so it does not log in again
+        return {
+            CONF_EMAIL: email,
+            CONF_PASSWORD: password,
+            "access_token": api.access_token,
+            "refresh_token": api.refresh_token,
+            "token_expires": api.expires_at,
+        }, None
+
     async def async_step_user(self, user_input=None) -> FlowResult:
         errors = {}
 
         if user_input is not None:
             email = user_input[CONF_EMAIL]
-            password = user_input[CONF_PASSWORD]
-
-            session = async_get_clientsession(self.hass)
-            api = VitesyOAuth(email, password, session)
-            try:
-                await self.hass.async_add_executor_job(api.login)
-                if not api.access_token:
-                    errors["base"] = "invalid_auth"
-                else:
-                    return self.async_create_entry(title=email, data={
-                        CONF_EMAIL: email,
-                        CONF_PASSWORD: password,
-                        "access_token": api.access_token,
-                        "refresh_token": api.refresh_token,
-                        "token_expires": api.expires_at,
-                    })
-            except Exception as e:
-                _LOGGER.exception("Error logging in to Vitesy API: %s", e)
-                errors["base"] = "cannot_connect"
+            data, error = await self._async_login(email, user_input[CONF_PASSWORD])
+            if data:
+                return self.async_create_entry(title=email, data=data)
+            errors["base"] = error
 
         return self.async_show_form(
             step_id="user",
@@ -50,6 +63,30 @@ class VitesyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_reauth(self, entry_data) -> FlowResult:
+        """Start reauth when the stored refresh token is rejected."""
+        self._reauth_entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None) -> FlowResult:
+        errors = {}
+        email = self._reauth_entry.data[CONF_EMAIL]
+
+        if user_input is not None:
+            data, error = await self._async_login(email, user_input[CONF_PASSWORD])
+            if data:
+                return self.async_update_reload_and_abort(self._reauth_entry, data=data)
+            errors["base"] = error
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({
+                vol.Required(CONF_PASSWORD): str,
+            }),
+            description_placeholders={"email": email},
+            errors=errors,
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -20,6 +20,50 @@ DEVICES_URL = f"{API_BASE_URL}/devices"
 MEASUREMENTS_URL = f"{API_BASE_URL}/measurements"
 MAINTENANCE_URL_TEMPLATE = f"{API_BASE_URL}/devices/{{device_id}}/maintenance"
 
+# Device list projections: full records for discovery, minimal ones for polling
+DEVICES_FULL_EXPAND = "all,-place"
+DEVICES_SUMMARY_EXPAND = "battery,program,maintenance"
+DEVICES_SUMMARY_KEYS = ("id", "connected", "battery", "program", "maintenance", "firmware_version", "model")
+DEVICES_FULL_REFRESH_INTERVAL = 6 * 3600  # seconds
+
+# Rolling statistics kept in memory per sensor id (derived min/max/mean/rate sensors)
+STATISTICS_WINDOW = 12  # samples per sensor
+STATISTIC_SENSORS = {
+    "DOC-SY": ("rate",),
+    "DOT-SY": ("rate",),
+    "TMP01-SY": ("mean", "min", "max", "rate"),
+    "SN02C2-N2": ("mean",),
+    "SN02VD-N2": ("mean",),
+    "SN02C2-E0": ("mean",),
+    "SN02VD-E0": ("mean",),
+}
+
+# Dedicated worker pool for the blocking API client
+EXECUTOR_MAX_WORKERS = 4
+DATA_EXECUTOR = f"{DOMAIN}_executor"
+
+# Local measurement history (SQLite, in the config directory)
+HISTORY_DB_FILE = f"{DOMAIN}_history.db"
+HISTORY_RETENTION_DAYS = 30
+DATA_HISTORY = f"{DOMAIN}_history"
+
+# Per-field change events (fired on the bus and to in-process subscribers)
+EVENT_CHANGE = f"{DOMAIN}_change"
+CHANGE_PROGRAM = "program"
+CHANGE_DOOR_OPENINGS = "door_openings"
+CHANGE_CONNECTED = "connected"
+CHANGE_MAINTENANCE_DUE = "maintenance_due"
+
+# Services
+SERVICE_PROFILE = "profile"
+SERVICE_GET_HISTORY = "get_history"
+ATTR_CYCLES = "cycles"
+ATTR_DEVICE_ID = "device_id"
+ATTR_SENSOR_ID = "sensor_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_AGGREGATE = "aggregate"
+
 # Other
 DEFAULT_SCAN_INTERVAL = 300  # seconds
 OAUTH_HEADERS = {
@@ -1,13 +1,30 @@
-from datetime import timedelta
+import asyncio
+from datetime import datetime, timedelta
 import logging
+import time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    EVENT_CHANGE,
+    DEVICES_SUMMARY_KEYS,
+    DEVICES_FULL_REFRESH_INTERVAL,
+    STATISTICS_WINDOW,
+    STATISTIC_SENSORS,
+)
+from .api import VitesyAuthError
+from .changes import diff_snapshots, snapshot_device
+from .profiler import RefreshProfiler
+from .ringbuffer import RingBuffer
 
 _LOGGER = logging.getLogger(__name__)
 
 class VitesyDataUpdateCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, api):
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, api, executor, history):
         super().__init__(
             hass,
             _LOGGER,
@@ -16,34 +33,234 @@ class VitesyDataUpdateCoordinator(DataUpdateCoordinator):
         )
         self.entry = entry
         self.api = api
+        self.executor = executor
+        self.history = history
         self.devices = []
+        self._full_devices = {}
+        self._full_fetched_at = 0
+        self.statistics = {}
+        self._last_sample_ts = {}
+        self._snapshots = {}
+        self._change_subscribers = []
+        self.profiler = None
 
     async def _async_update_data(self):
         try:
-            self.devices = await self._get_devices()
-            for device in self.devices:
-                device_id = device["id"]
-                device_type = device["type"]
-                firmware_version = device["firmware_version"]
-                # device["apikey"] = await self._get_or_create_api_key()
-                device["measurements"] = await self._get_measurements(device_id)
-                device["maintenancehistory"] = await self._get_maintenance(device_id)
-                device["programs"] = await self._get_programs(device_type, firmware_version)
-            return self.devices
+            self.devices = await self._get_device_list()
+            samples = await asyncio.gather(*(self._update_device(device) for device in self.devices))
+        except VitesyAuthError as err:
+            raise ConfigEntryAuthFailed(f"Vitesy authentication failed: {err}") from err
         except Exception as err:
             raise UpdateFailed(f"Error fetching Vitesy data: {err}")
 
-    async def _get_devices(self):
-        return await self.hass.async_add_executor_job(self.api.get_devices)
+        self._async_store_tokens()
+        self._async_dispatch_changes()
+
+        try:
+            await self.async_run_job(
+                self.history.append, [row for _, rows, _ in samples for row in rows], phase="history"
+            )
+        except Exception as err:
+            _LOGGER.warning("Failed to store Vitesy measurement history: %s", err)
+        else:
+            # Only mark samples as seen once they are stored, so a failed refresh retries them
+            for device_id, _, last_timestamp in samples:
+                if last_timestamp is not None:
+                    self._last_sample_ts[device_id] = last_timestamp
+        return self.devices
+
+    @callback
+    def async_subscribe_changes(self, change_callback, device_id=None, fields=None):
+        """Call ``change_callback(VitesyChange)`` for each changed field.
+
+        ``device_id`` (MAC with or without colons) and ``fields`` (one field
+        name or an iterable of them) narrow the subscription. Returns a
+        callable that unsubscribes; calling it again is a no-op.
+        """
+        if isinstance(fields, str):
+            fields = (fields,)
+        subscriber = (
+            change_callback,
+            device_id.replace(":", "") if device_id else None,
+            frozenset(fields) if fields else None,
+        )
+        self._change_subscribers.append(subscriber)
+
+        @callback
+        def _unsubscribe():
+            if subscriber in self._change_subscribers:
+                self._change_subscribers.remove(subscriber)
+
+        return _unsubscribe
+
+    @callback
+    def _async_dispatch_changes(self):
+        """Diff the new device snapshots against the previous ones and emit changes."""
+        snapshots = {device["id"].replace(":", ""): snapshot_device(device) for device in self.devices}
+        previous, self._snapshots = self._snapshots, snapshots
+        for device_id, snapshot in snapshots.items():
+            if device_id not in previous:
+                continue
+            for change in diff_snapshots(device_id, previous[device_id], snapshot):
+                self.hass.bus.async_fire(EVENT_CHANGE, change.as_event_data())
+                for change_callback, wanted_device, wanted_fields in list(self._change_subscribers):
+                    if wanted_device and wanted_device != device_id:
+                        continue
+                    if wanted_fields and change.field not in wanted_fields:
+                        continue
+                    try:
+                        change_callback(change)
+                    except Exception:
+                        _LOGGER.exception("Error in Vitesy change subscriber")
+
+    @callback
+    def _async_store_tokens(self):
+        """Persist refreshed tokens so a restart does not need a full login."""
+        if self.entry.data.get("refresh_token") == self.api.refresh_token and self.entry.data.get("access_token") == self.api.access_token:
+            return
+        self.hass.config_entries.async_update_entry(self.entry, data={
+            **self.entry.data,
+            "access_token": self.api.access_token,
+            "refresh_token": self.api.refresh_token,
+            "token_expires": self.api.expires_at,
+        })
+
+    async def _update_device(self, device):
+        # device["apikey"] = await self._get_or_create_api_key()
+        device.update(await self._get_device_details(device["id"], device["type"], device["firmware_version"]))
+        if self.profiler is not None:
+            with self.profiler.phase("assemble"):
+                return self._record_samples(device)
+        return self._record_samples(device)
+
+    async def _async_refresh(self, *args, **kwargs):
+        if self.profiler is None:
+            return await super()._async_refresh(*args, **kwargs)
+
+        profiler = self.profiler
+        with profiler.cycle():
+            await super()._async_refresh(*args, **kwargs)
+        if profiler.done:
+            self.profiler = None
+            self.api.timing_hook = None
+            await self._async_write_profile(profiler)
 
-    async def _get_measurements(self, device_id):
-        return await self.hass.async_add_executor_job(self.api.get_measurements, device_id)
+    @callback
+    def async_update_listeners(self):
+        if self.profiler is None:
+            super().async_update_listeners()
+            return
+        with self.profiler.phase("state_write"):
+            super().async_update_listeners()
+
+    async def async_start_profiling(self, cycles):
+        """Profile the next ``cycles`` refreshes and write the results to the config dir."""
+        if self.profiler is not None:
+            _LOGGER.warning("Profiling already running for %s", self.entry.title)
+            return
+        self.profiler = RefreshProfiler(cycles)
+        self.api.timing_hook = self.profiler.add_timing
+        await self.async_request_refresh()
+
+    async def _async_write_profile(self, profiler):
+        stamp = dt_util.now().strftime("%Y%m%d-%H%M%S")
+        base = self.hass.config.path(f"{DOMAIN}_profile_{self.entry.entry_id}_{stamp}")
+        try:
+            await self.hass.async_add_executor_job(profiler.write, f"{base}.prof", f"{base}.txt")
+        except Exception as err:
+            _LOGGER.error("Failed to write Vitesy refresh profile to %s: %s", base, err)
+            return
+        _LOGGER.info("Vitesy refresh profile written to %s.prof and %s.txt", base, base)
+
+    async def async_run_job(self, func, *args, phase="api"):
+        """Run a blocking call on the integration's own worker pool."""
+        if self.profiler is not None:
+            return await self.hass.loop.run_in_executor(self.executor, self.profiler.wrap_job(func, *args, phase=phase))
+        return await self.hass.loop.run_in_executor(self.executor, func, *args)
+
+    async def _get_device_list(self):
+        """Return device records, using the lightweight projection when possible.
+
+        The full expansion is only requested on first refresh, when a device
+        appears/disappears, when firmware or model changes, and periodically
+        to resync the slow-moving fields.
+        """
+        if self._full_devices and time.monotonic() - self._full_fetched_at < DEVICES_FULL_REFRESH_INTERVAL:
+            summary = await self._get_devices_summary()
+            if self._summary_matches_cache(summary):
+                return [
+                    {**self._full_devices[item["id"]], **{k: item[k] for k in DEVICES_SUMMARY_KEYS if k in item}}
+                    for item in summary
+                ]
+            _LOGGER.debug("Device list changed, fetching full device records")
+
+        devices = await self._get_devices()
+        self._full_devices = {device["id"]: device for device in devices}
+        self._full_fetched_at = time.monotonic()
+        return [dict(device) for device in devices]
+
+    def _record_samples(self, device):
+        """Push new samples into the ring buffers.
+
+        Returns ``(device_id, history rows, newest timestamp)``; the caller
+        advances ``_last_sample_ts`` once the rows are stored.
+        """
+        device_id = device["id"].replace(":", "")
+        measurements = device.get("measurements")
+        rows = []
+        if not isinstance(measurements, list):
+            return device_id, rows, None
+        last_timestamp = self._last_sample_ts.get(device_id, 0)
+        newest = None
+        for measurement in reversed(measurements):
+            try:
+                timestamp = datetime.fromisoformat(measurement["timestamp"].replace("Z", "+00:00")).timestamp()
+            except (KeyError, AttributeError, ValueError):
+                continue
+            if timestamp <= last_timestamp:
+                continue
+            for sensor in measurement.get("sensors_data", []):
+                sensor_id = sensor.get("id")
+                value = (sensor.get("value") or {}).get("avg")
+                if not sensor_id or not isinstance(value, (int, float)):
+                    continue
+                rows.append((device_id, sensor_id, timestamp, float(value)))
+                if sensor_id in STATISTIC_SENSORS:
+                    buffer = self.statistics.get((device_id, sensor_id))
+                    if buffer is None:
+                        buffer = self.statistics[(device_id, sensor_id)] = RingBuffer(STATISTICS_WINDOW)
+                    elif buffer.last_timestamp is not None and timestamp <= buffer.last_timestamp:
+                        continue
+                    buffer.append(timestamp, float(value))
+            newest = timestamp if newest is None else max(newest, timestamp)
+        return device_id, rows, newest
+
+    def request_full_device_refresh(self):
+        """Make the next refresh fetch the full device records again."""
+        self._full_fetched_at = 0
+
+    def _summary_matches_cache(self, summary):
+        if {item["id"] for item in summary} != set(self._full_devices):
+            return False
+        for item in summary:
+            cached = self._full_devices[item["id"]]
+            for key in ("firmware_version", "model"):
+                if key in item and item[key] != cached.get(key):
+                    return False
+        return True
+
+    async def _get_devices(self):
+        return await self.async_run_job(self.api.get_devices)
 
-    async def _get_maintenance(self, device_id):
-        return await self.hass.async_add_executor_job(self.api.get_maintenance, device_id)
+    async def _get_devices_summary(self):
+        return await self.async_run_job(self.api.get_devices_summary)
 
-    async def _get_programs(self, device_type, firmware_version):
-        return await self.hass.async_add_executor_job(self.api.get_programs, device_type, firmware_version)
+    async def _get_device_details(self, device_id, device_type, firmware_version):
+        if self.profiler is not None:
+            # Timed inside the worker so pool queue wait is not billed to the device
+            fetch = self.profiler.time_device(device_id, self.api.get_device_details)
+            return await self.async_run_job(fetch, device_id, device_type, firmware_version)
+        return await self.async_run_job(self.api.get_device_details, device_id, device_type, firmware_version)
 
     # async def _get_or_create_api_key(self):
-        # return await self.hass.async_add_executor_job(self.api.get_or_create_api_key)
+        # return await self.async_run_job(self.api.get_or_create_api_key)
@@ -0,0 +1,85 @@
+import logging
+import sqlite3
+import threading
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+PRUNE_INTERVAL = 3600  # seconds
+
+AGGREGATES = {
+    "min": "MIN(value)",
+    "max": "MAX(value)",
+    "mean": "AVG(value)",
+    "count": "COUNT(*)",
+}
+
+
+class VitesyHistoryStore:
+    """Local SQLite time-series of measurement sensors_data values.
+
+    Rows are keyed by (device_id, sensor_id, ts) so range queries for one
+    sensor are a single index scan. All methods are blocking and are meant to
+    run on the integration's worker pool; a lock serialises the connection.
+    """
+
+    def __init__(self, path, retention_days):
+        self.path = path
+        self.retention = retention_days * 86400
+        self._conn = None
+        self._lock = threading.Lock()
+        self._last_prune = 0
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS samples ("
+                "device_id TEXT NOT NULL, sensor_id TEXT NOT NULL, ts REAL NOT NULL, value REAL NOT NULL, "
+                "PRIMARY KEY (device_id, sensor_id, ts)) WITHOUT ROWID"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS samples_ts ON samples (ts)")
+        return self._conn
+
+    def append(self, rows):
+        """Insert (device_id, sensor_id, ts, value) rows, ignoring duplicates."""
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany("INSERT OR IGNORE INTO samples VALUES (?, ?, ?, ?)", rows)
+            if time.time() - self._last_prune >= PRUNE_INTERVAL:
+                self._prune(conn)
+
+    def _prune(self, conn):
+        with conn:
+            deleted = conn.execute("DELETE FROM samples WHERE ts < ?", (time.time() - self.retention,)).rowcount
+        self._last_prune = time.time()
+        if deleted:
+            _LOGGER.debug("Pruned %s history samples older than retention", deleted)
+
+    def query(self, device_id, sensor_id, start, end, aggregate=None):
+        """Return samples in [start, end] or a single aggregate over them."""
+        with self._lock:
+            conn = self._connection()
+            if aggregate:
+                (value,) = conn.execute(
+                    f"SELECT {AGGREGATES[aggregate]} FROM samples "
+                    "WHERE device_id = ? AND sensor_id = ? AND ts BETWEEN ? AND ?",
+                    (device_id, sensor_id, start, end),
+                ).fetchone()
+                return value
+            return conn.execute(
+                "SELECT ts, value FROM samples "
+                "WHERE device_id = ? AND sensor_id = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                (device_id, sensor_id, start, end),
+            ).fetchall()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
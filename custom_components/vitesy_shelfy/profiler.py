@@ -0,0 +1,130 @@
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_LOGGER = logging.getLogger(__name__)
+
+TOP_FUNCTIONS = 30
+
+
+class RefreshProfiler:
+    """Collect cProfile stats and phase/device timings for N refresh cycles.
+
+    Only created while the ``profile`` service is active, so the coordinator
+    pays no overhead otherwise.
+    """
+
+    def __init__(self, cycles):
+        self.cycles = cycles
+        self.completed = 0
+        self.unprofiled = 0
+        self.phases = defaultdict(float)
+        self.devices = defaultdict(float)
+        self._lock = threading.Lock()
+        self._profile = cProfile.Profile()
+        self._thread_profiles = []
+
+    @property
+    def done(self):
+        return self.completed >= self.cycles
+
+    def add_timing(self, phase, seconds):
+        """Accumulate a phase timing; safe to call from worker threads."""
+        with self._lock:
+            self.phases[phase] += seconds
+
+    def add_device_timing(self, device_id, seconds):
+        with self._lock:
+            self.devices[device_id] += seconds
+
+    def time_device(self, device_id, func):
+        """Wrap ``func`` so its run time in the worker is recorded for ``device_id``."""
+
+        def _timed(*args):
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self.add_device_timing(device_id, time.perf_counter() - start)
+
+        return _timed
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(name, time.perf_counter() - start)
+
+    @contextmanager
+    def cycle(self):
+        """Profile one refresh cycle on the event loop thread.
+
+        Python 3.12+ allows a single active profiler per process, so when
+        another account's cycle or HA's profiler integration already holds it
+        the cycle degrades to timings only.
+        """
+        try:
+            self._profile.enable()
+            enabled = True
+        except ValueError:
+            enabled = False
+            self.unprofiled += 1
+        try:
+            with self.phase("total"):
+                yield
+        finally:
+            if enabled:
+                self._profile.disable()
+            self.completed += 1
+
+    def wrap_job(self, func, *args, phase="api"):
+        """Return a callable that runs ``func`` under a worker-thread profiler."""
+
+        def _job():
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Python 3.12+ allows a single active profiler per process
+                profile = None
+            try:
+                with self.phase(phase):
+                    return func(*args)
+            finally:
+                if profile is not None:
+                    profile.disable()
+                    with self._lock:
+                        self._thread_profiles.append(profile)
+
+        return _job
+
+    def write(self, prof_path, summary_path):
+        """Dump the pstats file and a text summary (blocking, run in executor)."""
+        out = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=out)
+        for profile in self._thread_profiles:
+            stats.add(profile)
+        stats.dump_stats(prof_path)
+
+        out.write(f"Vitesy refresh profile: {self.completed} cycle(s)\n")
+        if self.unprofiled:
+            out.write(f"{self.unprofiled} cycle(s) ran with timings only: another profiler was active\n")
+        out.write("\n")
+        out.write("Phase timings (seconds, summed over cycles):\n")
+        for name, seconds in sorted(self.phases.items(), key=lambda item: -item[1]):
+            out.write(f"  {name:<14} {seconds:10.4f}\n")
+        out.write("\nDevice timings (seconds, summed over cycles):\n")
+        for device_id, seconds in sorted(self.devices.items(), key=lambda item: -item[1]):
+            out.write(f"  {device_id:<20} {seconds:10.4f}\n")
+        out.write(f"\nTop {TOP_FUNCTIONS} functions by cumulative time:\n")
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+
+        with open(summary_path, "w", encoding="utf-8") as summary:
+            summary.write(out.getvalue())
@@ -0,0 +1,82 @@
+from array import array
+
+
+class RingBuffer:
+    """Fixed-size, array-backed buffer of (timestamp, value) samples.
+
+    Appending is O(1) and keeps a running sum so the mean is O(1) as well;
+    min/max scan at most ``capacity`` slots.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._head = 0
+        self._count = 0
+        self._sum = 0.0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, timestamp, value):
+        if self._count == self.capacity:
+            self._sum -= self._values[self._head]
+        else:
+            self._count += 1
+        self._timestamps[self._head] = timestamp
+        self._values[self._head] = value
+        self._sum += value
+        self._head = (self._head + 1) % self.capacity
+
+    def _index(self, offset):
+        """Return the slot of the ``offset``-th oldest sample."""
+        return (self._head - self._count + offset) % self.capacity
+
+    @property
+    def last_timestamp(self):
+        if not self._count:
+            return None
+        return self._timestamps[self._index(self._count - 1)]
+
+    def _window(self):
+        if self._count == self.capacity:
+            return self._values
+        return [self._values[self._index(i)] for i in range(self._count)]
+
+    def mean(self):
+        if not self._count:
+            return None
+        return self._sum / self._count
+
+    def min(self):
+        return min(self._window()) if self._count else None
+
+    def max(self):
+        return max(self._window()) if self._count else None
+
+    def rate(self):
+        """Change per hour between the oldest and newest sample."""
+        if self._count < 2:
+            return None
+        first, last = self._index(0), self._index(self._count - 1)
+        elapsed = self._timestamps[last] - self._timestamps[first]
+        if elapsed <= 0:
+            return None
+        return (self._values[last] - self._values[first]) * 3600 / elapsed
+
+    def counter_rate(self):
+        """Increase per hour of a counter; after a reset the new value counts as the increase."""
+        if self._count < 2:
+            return None
+        first, last = self._index(0), self._index(self._count - 1)
+        elapsed = self._timestamps[last] - self._timestamps[first]
+        if elapsed <= 0:
+            return None
+        increase = 0.0
+        previous = self._values[first]
+        for offset in range(1, self._count):
+            value = self._values[self._index(offset)]
+            increase += value - previous if value >= previous else value
+            previous = value
+        return increase * 3600 / elapsed
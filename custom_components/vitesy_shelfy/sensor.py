@@ -7,12 +7,21 @@ from homeassistant.const import (
     CONCENTRATION_PARTS_PER_MILLION,
     CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
 )
-from .const import DOMAIN
-from datetime import datetime, timezone
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from .const import DOMAIN, STATISTIC_SENSORS
+from datetime import datetime, timedelta, timezone
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
+def _maintenance_due(device, key):
+    """Return the maintenance due date for ``key`` as an aware datetime, or None."""
+    try:
+        return datetime.fromisoformat(device["maintenance"][key].get("due_date").replace("Z", "+00:00"))
+    except (KeyError, ValueError, AttributeError):
+        return None
+
 def extend_shared(extra: dict) -> dict:
     return {**SHARED_SENSOR_TYPES, **extra}
 
@@ -213,6 +222,65 @@ ETERIA_SENSOR_TYPES = extend_shared({
     },
 })
 
+# Derived sensors computed from the coordinator's rolling ring buffers
+STATISTIC_SENSOR_TYPES = {
+    "DOC-SY-rate": {
+        "name": "Door Openings per Hour",
+        "counter": True,
+        "unit": "1/h",
+        "device_class": None,
+        "icon": "mdi:door-open",
+    },
+    "DOT-SY-rate": {
+        "name": "Door Opening Seconds per Hour",
+        "counter": True,
+        "unit": "s/h",
+        "device_class": None,
+        "icon": "mdi:timer",
+    },
+    "TMP01-SY-mean": {
+        "name": "Fridge Temperature Average",
+        "unit": UnitOfTemperature.CELSIUS,
+        "device_class": SensorDeviceClass.TEMPERATURE,
+    },
+    "TMP01-SY-min": {
+        "name": "Fridge Temperature Minimum",
+        "unit": UnitOfTemperature.CELSIUS,
+        "device_class": SensorDeviceClass.TEMPERATURE,
+    },
+    "TMP01-SY-max": {
+        "name": "Fridge Temperature Maximum",
+        "unit": UnitOfTemperature.CELSIUS,
+        "device_class": SensorDeviceClass.TEMPERATURE,
+    },
+    "TMP01-SY-rate": {
+        "name": "Fridge Temperature Trend",
+        "unit": f"{UnitOfTemperature.CELSIUS}/h",
+        "device_class": None,
+        "icon": "mdi:thermometer-lines",
+    },
+    "SN02C2-N2-mean": {
+        "name": "CO2 Average",
+        "unit": CONCENTRATION_PARTS_PER_MILLION,
+        "device_class": SensorDeviceClass.CO2,
+    },
+    "SN02VD-N2-mean": {
+        "name": "VOC Average",
+        "unit": CONCENTRATION_PARTS_PER_MILLION,
+        "device_class": SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS_PARTS,
+    },
+    "SN02C2-E0-mean": {
+        "name": "CO2 Average",
+        "unit": CONCENTRATION_PARTS_PER_MILLION,
+        "device_class": SensorDeviceClass.CO2,
+    },
+    "SN02VD-E0-mean": {
+        "name": "VOC Average",
+        "unit": CONCENTRATION_PARTS_PER_MILLION,
+        "device_class": SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS_PARTS,
+    },
+}
+
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]
     entities = []
@@ -254,6 +322,17 @@ async def async_setup_entry(hass, entry, async_add_entities):
                 if sensor_id in sensor_types:
                     entities.append(VitesySensor(coordinator, device_id, device_type, sensor_id, sensor_types))
 
+        # Add derived statistics for buffered sensors_data ids
+        sensor_ids = {
+            sensor.get("id")
+            for measurement in device.get("measurements", [])
+            for sensor in measurement.get("sensors_data", [])
+        }
+        for sensor_id, stats in STATISTIC_SENSORS.items():
+            if sensor_id in sensor_ids and sensor_id in sensor_types:
+                for stat in stats:
+                    entities.append(VitesyStatisticSensor(coordinator, device_id, device_type, sensor_id, stat))
+
         #  Add from maintenance
         for maintenance_key in device.get("maintenance", {}):
             if maintenance_key in sensor_types:
@@ -276,6 +355,9 @@ class VitesySensor(CoordinatorEntity, SensorEntity):
         self._attr_icon = self._sensor_types[sensor_type].get("icon")
         self._attr_translation_key = sensor_type.replace("_","-").lower()
         self._attr_has_entity_name = True
+        # "filterdays"/"fridgedays" count down locally from the cached due date
+        self._countdown_key = sensor_type[:-len("days")] if sensor_type.endswith("days") else None
+        self._unsub_countdown = None
 
     @property
     def device_info(self):
@@ -285,7 +367,51 @@ class VitesySensor(CoordinatorEntity, SensorEntity):
             "model": self.device_type,
             "name": f"Vitesy {self.device_type.title()}",
         }
-        
+
+    @property
+    def available(self):
+        # Countdowns keep advancing from the cached snapshot while the cloud is unreachable
+        if self._countdown_key and self.coordinator.data:
+            return True
+        return super().available
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        if self._countdown_key:
+            self._schedule_countdown()
+            self.async_on_remove(self._cancel_countdown)
+
+    @callback
+    def _handle_coordinator_update(self):
+        if self._countdown_key:
+            self._schedule_countdown()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _cancel_countdown(self):
+        if self._unsub_countdown:
+            self._unsub_countdown()
+            self._unsub_countdown = None
+
+    @callback
+    def _schedule_countdown(self):
+        """Schedule a local state update for when the remaining days next change."""
+        self._cancel_countdown()
+        device = next((d for d in self.coordinator.data if d["id"].replace(":", "") == self.device_id), None)
+        due = _maintenance_due(device, self._countdown_key) if device else None
+        if due is None:
+            return
+        now = datetime.now(timezone.utc)
+        # (due - now).days drops by one each time now crosses due - N days
+        next_change = due - timedelta(days=(due - now).days) + timedelta(seconds=1)
+        self._unsub_countdown = async_track_point_in_utc_time(self.hass, self._handle_countdown, next_change)
+
+    @callback
+    def _handle_countdown(self, now):
+        self._unsub_countdown = None
+        self.async_write_ha_state()
+        self._schedule_countdown()
+
     @property
     def native_value(self):
         device = next(d for d in self.coordinator.data if d["id"].replace(":", "") == self.device_id)
@@ -379,18 +505,51 @@ class VitesySensor(CoordinatorEntity, SensorEntity):
 
         # Case: From maintenance
         if self.sensor_type in device.get("maintenance", {}):
-            try:
-                return datetime.fromisoformat(device["maintenance"][self.sensor_type].get("due_date").replace("Z", "+00:00"))
-            except (KeyError, ValueError):
-                return None                
-        if self.sensor_type.replace("days", "") in device.get("maintenance", {}):
-            try:
-                return (
-                    datetime.fromisoformat(
-                        device["maintenance"][self.sensor_type.replace("days", "")].get("due_date").replace("Z", "+00:00")
-                    ) - datetime.now(timezone.utc)
-                ).days
-            except (KeyError, ValueError):
-                return None                
+            return _maintenance_due(device, self.sensor_type)
+        if self._countdown_key in device.get("maintenance", {}):
+            due = _maintenance_due(device, self._countdown_key)
+            return (due - datetime.now(timezone.utc)).days if due else None
 
         return None
+
+
+class VitesyStatisticSensor(CoordinatorEntity, SensorEntity):
+    """Rolling min/max/mean/rate over the coordinator's ring buffer for one sensor id."""
+
+    def __init__(self, coordinator, device_id, device_type, sensor_id, stat):
+        super().__init__(coordinator)
+        self.device_id = device_id
+        self.device_type = device_type
+        self.sensor_id = sensor_id
+        self.stat = stat
+        description = STATISTIC_SENSOR_TYPES[f"{sensor_id}-{stat}"]
+        # Counters (DOC-SY/DOT-SY) can reset, so their rate only sums increases
+        self._method = "counter_rate" if stat == "rate" and description.get("counter") else stat
+        self._attr_unique_id = f"vitesy_{device_type.lower()}_{device_id}_{sensor_id}_{stat}"
+        self._attr_native_unit_of_measurement = description["unit"]
+        self._attr_device_class = description["device_class"]
+        self._attr_icon = description.get("icon")
+        self._attr_translation_key = f"{sensor_id}-{stat}".lower()
+        self._attr_has_entity_name = True
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, self.device_id)},
+            "manufacturer": "Vitesy",
+            "model": self.device_type,
+            "name": f"Vitesy {self.device_type.title()}",
+        }
+
+    @property
+    def native_value(self):
+        buffer = self.coordinator.statistics.get((self.device_id, self.sensor_id))
+        if buffer is None:
+            return None
+        value = getattr(buffer, self._method)()
+        return round(value, 2) if value is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        buffer = self.coordinator.statistics.get((self.device_id, self.sensor_id))
+        return {"samples": len(buffer) if buffer is not None else 0}
@@ -0,0 +1,349 @@
+"""Load-scaling harness for the vitesy_shelfy integration.
+
+Boots an in-process Home Assistant instance in a temporary config directory,
+adds a growing number of vitesy_shelfy config entries against a local fake
+Vitesy backend and reports, for each step:
+
+- setup time per entry (config flow + async_setup_entry + platforms)
+- CPU and wall time per refresh of all coordinators; the fake backend runs in
+  a subprocess so its request handling is not counted
+- event-loop lag (max / p95) while refreshing
+- resident set size
+
+Requires a Home Assistant install in the current environment:
+
+    python scripts/scaling_harness.py --entries 1,5,10,25 --devices 1,10 --refreshes 3
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+DOMAIN = "vitesy_shelfy"
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class FakeVitesyBackend(ThreadingHTTPServer):
+    """Minimal stand-in for auth.vitesy.com and the Vitesy Hub API."""
+
+    daemon_threads = True
+
+    def __init__(self, devices_per_account):
+        super().__init__(("127.0.0.1", 0), FakeVitesyHandler)
+        self.devices_per_account = devices_per_account
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def devices(self, account, expand):
+        """Device records for ``account``, trimmed unless ``expand`` asks for everything."""
+        account_index = sum(account.encode()) % 256
+        full = "all" in expand.split(",")
+        return [self._device(account_index, i, full) for i in range(self.devices_per_account)]
+
+    @staticmethod
+    def _device(account_index, i, full):
+        due = datetime.now(timezone.utc) + timedelta(days=10)
+        device = {
+            "id": f"AA:{account_index:02X}:{i // 256:02X}:{i % 256:02X}:00:01",
+            "type": "shelfy",
+            "model": "SY-01",
+            "firmware_version": "1.0.0",
+            "connected": True,
+            "battery": {"level": 80, "charging": False},
+            "program": {"ref": "shelf-s0"},
+            "maintenance": {
+                "filter": {"due_date": _iso(due), "period_days": 30},
+                "fridge": {"due_date": _iso(due + timedelta(days=5)), "period_days": 60},
+            },
+        }
+        if full:
+            # Fields only returned by the full 'all,-place' expansion
+            device.update({
+                "wifi_SSID": "harness",
+                "wifi_RSSI": -52,
+                "hardware_version": "2.1",
+                "created_at": _iso(due - timedelta(days=400)),
+                "settings": {"led": True, "sound": False, "timezone": "Europe/Rome", "units": "metric"},
+                "program": {
+                    "ref": "shelf-s0",
+                    "started_at": _iso(due - timedelta(days=3)),
+                    "schedule": [{"day": day, "from": "08:00", "to": "20:00"} for day in range(7)],
+                },
+                "firmware": {"version": "1.0.0", "available": "1.0.0", "channel": "stable"},
+                "owner": {"user_id": f"user-{account_index}", "role": "owner"},
+            })
+        return device
+
+
+def _iso(value):
+    return value.isoformat().replace("+00:00", "Z")
+
+
+class FakeVitesyHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _account(self):
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        return unquote(token.removeprefix("access:"))
+
+    def _form(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path == "/login":
+            self.send_response(200)
+            self.send_header("Set-Cookie", "XSRF-TOKEN=harness; Path=/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif url.path == "/devices":
+            self._send_json(self.server.devices(self._account(), query.get("expand", "")))
+        elif url.path == "/measurements":
+            self._send_json([{
+                "id": query.get("device_id"),
+                "timestamp": _iso(datetime.now(timezone.utc)),
+                "score": 0.8,
+                "sensors_data": [
+                    {"id": "TMP01-SY", "value": {"avg": 4.2}},
+                    {"id": "DOC-SY", "value": {"avg": 3}},
+                    {"id": "DOT-SY", "value": {"avg": 12}},
+                ],
+            }])
+        elif url.path.startswith("/devices/") and url.path.endswith("/maintenance"):
+            now = datetime.now(timezone.utc)
+            self._send_json({
+                kind: {
+                    "due_date": _iso(now + timedelta(days=days)),
+                    "period_days": period,
+                    "history": [
+                        {"done_at": _iso(now - timedelta(days=period * n - days)), "source": "app"}
+                        for n in range(1, 6)
+                    ],
+                }
+                for kind, days, period in (("filter", 10, 30), ("fridge", 15, 60))
+            })
+        elif url.path.rstrip("/") == "/programs":
+            self._send_json([{
+                "id": "shelf-s0",
+                "name": "Shelf",
+                "description": "Harness program",
+                "icon": "shelf",
+                "metadata": {"fan": 1, "power": 2},
+            }])
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        form = self._form()
+        if url.path == "/login":
+            self.send_response(302)
+            self.send_header("Location", f"hub.vitesy.com:/oauth2redirect?code={quote(form['username'], safe='')}&state=x")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif url.path == "/oauth2/token":
+            account = form.get("code") or form.get("refresh_token", "").removeprefix("refresh:")
+            self._send_json({
+                "access_token": f"access:{account}",
+                "refresh_token": f"refresh:{account}",
+                "expires_in": 3600,
+            })
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+
+class LoopLagMonitor:
+    """Sample how late the event loop wakes up a sleeping task."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    def start(self):
+        self.samples = []
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        return self.summary()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(loop.time() - start - self.interval)
+
+    def summary(self):
+        if not self.samples:
+            return 0.0, 0.0
+        ordered = sorted(self.samples)
+        return ordered[-1], ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        # ru_maxrss is the peak, in KiB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _serve_backend(devices_per_account, conn):
+    backend = FakeVitesyBackend(devices_per_account)
+    conn.send(backend.base_url)
+    conn.close()
+    backend.serve_forever()
+
+
+def start_backend(devices_per_account):
+    """Run the fake backend in its own process and return (process, base_url)."""
+    context = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = context.Pipe()
+    process = context.Process(target=_serve_backend, args=(devices_per_account, child_conn), daemon=True)
+    process.start()
+    return process, parent_conn.recv()
+
+
+def point_api_at(base_url):
+    api = importlib.import_module(f"custom_components.{DOMAIN}.api")
+    api.LOGIN_URL = f"{base_url}/login"
+    api.TOKEN_URL = f"{base_url}/oauth2/token"
+    api.API_BASE_URL = base_url
+    api.DEVICES_URL = f"{base_url}/devices"
+
+
+async def run_scenario(devices_per_account, entry_steps, refreshes):
+    from homeassistant import bootstrap, config_entries, runner
+
+    backend, base_url = start_backend(devices_per_account)
+
+    results = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        os.symlink(REPO_ROOT / "custom_components", Path(config_dir) / "custom_components")
+        Path(config_dir, "configuration.yaml").write_text("homeassistant:\n  name: vitesy-harness\n")
+        hass = await bootstrap.async_setup_hass(runner.RuntimeConfig(config_dir=config_dir, skip_pip=True))
+        await hass.async_start()
+        point_api_at(base_url)
+
+        lag = LoopLagMonitor()
+        entries = 0
+        try:
+            for target in entry_steps:
+                start = time.perf_counter()
+                while entries < target:
+                    await hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": config_entries.SOURCE_USER},
+                        data={"email": f"account{entries}@harness.local", "password": "harness"},
+                    )
+                    entries += 1
+                await hass.async_block_till_done()
+                setup_time = time.perf_counter() - start
+                added = max(target - (results[-1]["entries"] if results else 0), 1)
+
+                coordinators = list(hass.data[DOMAIN].values())
+                cpu, wall = [], []
+                lag.start()
+                for _ in range(refreshes):
+                    cpu_start, wall_start = time.process_time(), time.perf_counter()
+                    await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+                    await hass.async_block_till_done()
+                    cpu.append(time.process_time() - cpu_start)
+                    wall.append(time.perf_counter() - wall_start)
+                lag_max, lag_p95 = await lag.stop()
+
+                results.append({
+                    "devices_per_entry": devices_per_account,
+                    "entries": target,
+                    "entities": len(hass.states.async_entity_ids()),
+                    "setup_s_per_entry": setup_time / added,
+                    "refresh_cpu_s": statistics.mean(cpu),
+                    "refresh_wall_s": statistics.mean(wall),
+                    "loop_lag_max_ms": lag_max * 1000,
+                    "loop_lag_p95_ms": lag_p95 * 1000,
+                    "rss_mb": rss_mb(),
+                })
+                print_row(results[-1])
+        finally:
+            await hass.async_stop()
+            backend.terminate()
+            backend.join()
+    return results
+
+
+COLUMNS = (
+    ("devices_per_entry", "dev/entry", "{}"),
+    ("entries", "entries", "{}"),
+    ("entities", "entities", "{}"),
+    ("setup_s_per_entry", "setup/entry s", "{:.3f}"),
+    ("refresh_cpu_s", "refresh cpu s", "{:.3f}"),
+    ("refresh_wall_s", "refresh wall s", "{:.3f}"),
+    ("loop_lag_max_ms", "lag max ms", "{:.1f}"),
+    ("loop_lag_p95_ms", "lag p95 ms", "{:.1f}"),
+    ("rss_mb", "rss MB", "{:.1f}"),
+)
+
+
+def print_header():
+    print("  ".join(title for _, title, _ in COLUMNS))
+
+
+def print_row(row):
+    print("  ".join(fmt.format(row[key]).rjust(len(title)) for key, title, fmt in COLUMNS), flush=True)
+
+
+def _int_list(value):
+    return sorted({int(item) for item in value.split(",") if item})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=_int_list, default=[1, 5, 10, 25], help="comma separated entry counts")
+    parser.add_argument("--devices", type=_int_list, default=[1, 10], help="comma separated devices per entry")
+    parser.add_argument("--refreshes", type=int, default=3, help="refresh rounds measured per step")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    print_header()
+    results = []
+    for devices in args.devices:
+        results.extend(asyncio.run(run_scenario(devices, args.entries, args.refreshes)))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()